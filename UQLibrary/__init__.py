@@ -9,9 +9,9 @@
 import numpy as np
 import sys
 import warnings
-import matplotlib.pyplot as plt
-import scipy.integrate as integrate
-from tabulate import tabulate   
+import copy
+#matplotlib and tabulate are imported in plot_gsa and print_results so that
+#   they are only loaded when results are plotted or printed
 
 import mpi4py.MPI as MPI
 
@@ -61,92 +61,34 @@ class Model:
     #   takes in a vector of POIs and outputs a vector of QOIs
     def __init__(self,base_poi=np.empty(0), name_poi = "auto", \
                  name_qoi= "auto", cov=np.empty(0), \
-                 eval_fcn=np.empty(0), dist_type='uniform', dist_param="auto"):
+                 eval_fcn=np.empty(0), dist_type='uniform', dist_param="auto", base_qoi=None):
         #------------------------base_poi, n_poi, name_poi---------------------
         #Assign base_poi and n_poi
-        if not isinstance(base_poi,np.ndarray):                    #Confirm that base_poi is a numpy array
-            raise Exception("model.base_poi is not a numpy array")
+        base_poi=np.asarray(base_poi, dtype=np.float64)             #Coerce base_poi to a float numpy array
         if np.ndim(base_poi)>1:                                    #Check to see if base_poi is a vector
             base_poi=np.squeeze(base_poi)                     #Make a vector if an array with 1 dim greater than 1
             if np.ndim(base_poi)!=1:                               #Issue an error if base_poi is a matrix or tensor
                 raise Exception("Error! More than one dimension of size 1 detected for model.base_poi, model.base_poi must be dimension 1")
             else:                                                       #Issue a warning if dimensions were squeezed out of base POIs
                 warnings.warn("model.base_poi was reduced a dimension 1 array. No entries were deleted.")
-        self.base_poi=base_poi
-        del base_poi
+        self.base_poi=np.ascontiguousarray(base_poi)
         self.n_poi=self.base_poi.size
         
-        #Assign name_poi----------------UNFINISHED VALUE CHECKING
-        
-        POInumbers=np.arange(0,self.n_poi)
-        name_poi_auto=np.char.add('POI',POInumbers.astype('U'))
-        #Check name_poi is string
-        if type(name_poi)==np.ndarray:
-            #Check data type
-            if name_poi.size!= self.n_poi:
-                raise Exception("Incorrect number of entries in name_poi")
-        elif type(name_poi)==list:
-            #Check data type
-            if len(name_poi)!= self.n_poi:
-                raise Exception("Incorrect number of entries in name_poi")
-            name_poi=np.array(name_poi)
-        elif type(name_poi)==str and name_poi.lower()!="auto":
-            if self.n_poi!=1:
-                raise Exception("Only one qoi name entered for >1 pois")
-        else :
-            if name_poi.lower()!= "auto":
-                warnings.warn("Unrecognized name_poi entry, using automatic values")
-            name_poi = name_poi_auto
-        if (name_poi.size != self.n_poi) & (name_poi.size !=0):   #Check that correct size if given
-            warnings.warn("name_poi entered but the number of names does not match the number of POIs. Ignoring names.")
-            name_poi=np.empty(0)
-        if name_poi.size==0:                       
-            name_poi = name_poi_auto
-        self.name_poi = name_poi
-        del name_poi
+        #Assign name_poi
+        self.name_poi = normalize_names(name_poi, self.n_poi, 'POI')
         #-----------------eval_fcn, base_qoi, n_qoi, name_qoi------------------
-        #Assign evaluation function and compute base_qoi
+        #Assign evaluation function and compute base_qoi if not already known
         self.eval_fcn=eval_fcn
-        del eval_fcn
-        self.base_qoi=self.eval_fcn(self.base_poi)
-        if not isinstance(self.base_qoi,np.ndarray):                    #Confirm that base_qoi is a numpy array
-            warnings.warn("model.base_qoi is not a numpy array")
+        if base_qoi is None:
+            base_qoi=self.eval_fcn(self.base_poi)
+        self.base_qoi=np.atleast_1d(np.asarray(base_qoi, dtype=np.float64))     #Coerce base_qoi to a float numpy vector
         self.n_qoi=len(self.base_qoi)
         
-        #Assign name_qoi----------------UNFINISHED VALUE CHECKING
-        #Formulate automatic names so they can be referenced in each case
-        QOInumbers=np.arange(0,self.n_qoi)
-        name_qoi_auto=np.char.add('POI',QOInumbers.astype('U'))
-        #Check name_qoi is string
-        if type(name_qoi)==np.ndarray:
-            #Check data type
-            if name_qoi.size!= self.n_qoi:
-                raise Exception("Incorrect number of entries in name_qoi")
-        elif type(name_qoi)==list:
-            #Check data type
-            if len(name_qoi)!= self.n_qoi:
-                raise Exception("Incorrect number of entries in name_qoi")
-            name_qoi=np.array(name_qoi)
-        elif type(name_qoi)==str and name_qoi.lower()!="auto":
-            if self.n_qoi!=1:
-                raise Exception("Only one qoi name entered for >1 qois")
-        else :
-            if name_qoi.lower()!= "auto":
-                warnings.warn("Unrecognized name_qoi entry, using automatic values")
-            name_qoi= name_qoi_auto
-        if (name_qoi.size !=self.n_qoi) & (name_qoi.size !=0):    #Check names if given match number of QOIs
-            warnings.warn("name_qoi entered but the number of names does not match the number of QOIs. Ignoring names.")
-            name_qoi = name_qoi_auto
-        if name_qoi.size==0:                                 #If not given or incorrect size, number QOIs
-            name_qoi = name_qoi_auto
-        self.name_qoi = name_qoi
-        del name_qoi
-            
-            
-            
+        #Assign name_qoi
+        self.name_qoi = normalize_names(name_qoi, self.n_qoi, 'QOI')
             
         #------------------------------covariance matrix-----------------------
-        self.cov=cov
+        self.cov=np.asarray(cov, dtype=np.float64)
         if self.cov.size!=0 and np.shape(self.cov)!=(self.n_poi,self.n_poi): #Check correct sizing
             raise Exception("Error! model.cov is not an nPOI x nPOI array")
             
@@ -162,53 +104,27 @@ class Model:
                             " distributions are" + str(valid_distribution))
         else:
             self.dist_type=dist_type
-            del dist_type
                 
         #--------------------------------dist_param----------------------------
-        # Apply automatic distribution parameter settings
-        if str(dist_param).lower() == 'auto':
-            if (self.dist_type == "uniform" or self.dist_type == "saltelli uniform"):
-                self.dist_param=[[.8],[1.2]]*np.ones((2,self.n_poi))*self.base_poi
-                del dist_param
-            elif (self.dist_type == "normal" or self.dist_type == "saltelli normal"):
-                if cov.size()==0:
-                    self.dist_param=[[1],[.2]]*np.ones((2,self.n_poi))*self.base_poi
-                    del dist_param
-        # Apply manual distribution settings
-        elif type(dist_param) == np.ndarray:
-            #Check dimensions of numpy array are correct
-            if dist_param.shape[1] == self.n_poi:
-                # Correct number of parameters for each distribution
-                if (self.dist_type == "uniform" or self.dist_type == "saltelli uniform")\
-                    and dist_param.shape[0]!=2:
-                    raise Exception("2 parameters per POI required for uniform")
-                elif (self.dist_type == "normal" or self.dist_type == "saltelli normal")\
-                    and dist_param.shape[0]!=2:
-                    raise Exception("2 parameters per POI required for normal")
-                # Assign dist_param if conditions met
-                else :
-                    self.dist_param=dist_param
-                    del dist_param
-            else:
-                raise Exception("Incorrect shape of dist_param. Given shape: "\
-                                + dist_param.shape + ", desired shape: ... x n_poi") 
-        elif dist_param.lower() == "cov":
-            if np.any(self.dist_type.lower()==["normal", "saltelli normal"]):
-                self.dist_param=[self.base_poi, np.diag(self.cov,k=0)]   
-                del dist_param 
-            else :
-                raise Exception("Covariance based sampling only implemented for"\
-                                +"normal or saltelli normal distributions")
-        else:
-            raise Exception("Incorrect data-type for dist_param, use ndarray, 'auto', or 'cov'")
+        self.dist_param = normalize_dist_param(dist_param, self.dist_type, self.n_poi, \
+                                               self.base_poi, self.cov)
+        #Store as a contiguous float array so samplers never convert it again
+        self.dist_param = np.ascontiguousarray(self.dist_param, dtype=np.float64)
             
         #Construct Distribution function
         self.sample_fcn = gsa.get_samp_dist(self.dist_type, self.dist_param, self.n_poi)
     
     pass
     def copy(self):
-        return Model(base_poi=self.base_poi, name_poi = self.name_poi, name_qoi= self.name_qoi, cov=self.cov, \
-                 eval_fcn=self.eval_fcn, dist_type=self.dist_type,dist_param=self.dist_param)
+        #Attributes were validated when self was constructed, so copy them directly
+        #   rather than re-running __init__. Arrays are copied so the models stay independent
+        model_copy = copy.copy(self)
+        for attribute in ("base_poi", "name_poi", "base_qoi", "name_qoi", "cov", "dist_param"):
+            setattr(model_copy, attribute, getattr(self, attribute).copy())
+        #Rebind the sampler to the copied distribution parameters
+        model_copy.sample_fcn = gsa.get_samp_dist(model_copy.dist_type, model_copy.dist_param, \
+                                                  model_copy.n_poi)
+        return model_copy
 
 ##------------------------------------results-----------------------------------------------------
 # Define class "results" which holds a gsaResults object and lsaResults object
@@ -294,7 +210,9 @@ def run_uq(model, options, logging = False):
                      base_response = model.base_qoi)
 
     #Plot Samples
-    if options.gsa.run_sobol and options.gsa.run and options.plot and mpi_rank == 0:
+    #   Skip building figures entirely if they are neither displayed nor saved
+    if options.gsa.run_sobol and options.gsa.run and options.plot.run and \
+        (options.display or options.path) and mpi_rank == 0:
         if logging: 
             print("Plotting Results")
         plot_gsa(model, results.gsa.samp_d, results.gsa.f_d, options)
@@ -315,6 +233,7 @@ def print_results(results,model,options):
     options : Options
         Object of class Options holding run settings.
     """
+    from tabulate import tabulate
     # Print Results
     #Results Header
     #print('Sensitivity results for nSampSobol=' + str(options.gsa.n_samp_sobol))
@@ -325,11 +244,11 @@ def print_results(results,model,options):
         print('\n Base QOI Values')
         print(tabulate([model.base_qoi], headers=model.name_qoi))
         print('\n Sensitivity Indices')
-        print(tabulate(np.concatenate((model.name_poi.reshape(model.n_poi,1),np.transpose(results.lsa.jac)),1),
-              headers= np.append("",model.name_qoi)))
+        print(tabulate([[model.name_poi[i_poi], *results.lsa.jac[:,i_poi]] for i_poi in range(model.n_poi)],
+              headers= ["", *model.name_qoi]))
         print('\n Relative Sensitivity Indices')
-        print(tabulate(np.concatenate((model.name_poi.reshape(model.n_poi,1),np.transpose(results.lsa.rsi)),1),
-              headers= np.append("",model.name_qoi)))
+        print(tabulate([[model.name_poi[i_poi], *results.lsa.rsi[:,i_poi]] for i_poi in range(model.n_poi)],
+              headers= ["", *model.name_qoi]))
         #print("Fisher Matrix: " + str(results.lsa.fisher))
         #Active Subsapce Analysis
         if options.lsa.run_param_subset:
@@ -339,35 +258,145 @@ def print_results(results,model,options):
             print(results.lsa.inactive_set)
     if options.gsa.run: 
         if options.gsa.run_sobol:
-            if model.n_qoi==1:
-                print('\n Sobol Indices for ' + model.name_qoi[0])
-                print(tabulate(np.concatenate((model.name_poi.reshape(model.n_poi,1), results.gsa.sobol_base.reshape(model.n_poi,1), \
-                                               results.gsa.sobol_tot.reshape(model.n_poi,1)), 1),
-                               headers=["", "1st Order", "Total Sensitivity"]))
+            #Interleave 1st order and total indices of each QOI as columns so all
+            #   QOIs are printed in a single n_poi row table
+            sobol_table = np.stack((results.gsa.sobol_base.reshape(model.n_qoi, model.n_poi),
+                                    results.gsa.sobol_tot.reshape(model.n_qoi, model.n_poi)),
+                                   axis = 1).reshape(2*model.n_qoi, model.n_poi).transpose()
+            if model.n_qoi == 1:
+                print('\n Sobol Indices for '+ model.name_qoi[0])
+                headers = ["", "1st Order", "Total Sensitivity"]
             else:
-                for i_qoi in range(0,model.n_qoi):
-                    print('\n Sobol Indices for '+ model.name_qoi[i_qoi])
-                    print(tabulate(np.concatenate((model.name_poi.reshape(model.n_poi,1),results.gsa.sobol_base[[i_qoi],:].reshape(model.n_poi,1), \
-                        results.gsa.sobol_tot[[i_qoi],:].reshape(model.n_poi,1)),1), headers = ["", "1st Order", "Total Sensitivity"]))
+                print('\n Sobol Indices')
+                headers = ["", *[name_qoi + " " + index for name_qoi in model.name_qoi \
+                                 for index in ("1st Order", "Total")]]
+            print(tabulate([[model.name_poi[i_poi], *sobol_table[i_poi]] for i_poi in range(model.n_poi)],
+                           headers = headers))
     
         if options.gsa.run_morris:
-            if model.n_qoi==1:
+            #Interleave mu_star and sigma of each QOI as columns so all QOIs are
+            #   printed in a single n_poi row table
+            morris_table = np.stack((results.gsa.morris_mean_abs.reshape(model.n_poi, model.n_qoi),
+                                     results.gsa.morris_std.reshape(model.n_poi, model.n_qoi)),
+                                    axis = 2).reshape(model.n_poi, 2*model.n_qoi)
+            if model.n_qoi == 1:
                 print('\n Morris Screening Results for ' + model.name_qoi[0])
-                print(tabulate(np.concatenate((model.name_poi.reshape(model.n_poi, 1), results.gsa.morris_mean_abs.reshape(model.n_poi, 1), \
-                                               results.gsa.morris_std.reshape(model.n_poi, 1)), 1),
-                    headers=["", "mu_star", "sigma"]))
+                headers = ["", "mu_star", "sigma"]
             else:
-                for i_qoi in range(model.n_qoi):
-                    print('\n Morris Screening Results for ' + model.name_qoi[i_qoi])
-                    print(tabulate(np.concatenate(
-                        (model.name_poi.reshape(model.n_poi, 1), results.gsa.morris_mean_abs[:,[i_qoi]].reshape(model.n_poi, 1), \
-                     results.gsa.morris_std[:,[i_qoi]].reshape(model.n_poi, 1)), 1),
-                    headers=["", "mu_star", "sigma"]))
+                print('\n Morris Screening Results')
+                headers = ["", *[name_qoi + " " + index for name_qoi in model.name_qoi \
+                                 for index in ("mu_star", "sigma")]]
+            print(tabulate([[model.name_poi[i_poi], *morris_table[i_poi]] for i_poi in range(model.n_poi)],
+                           headers = headers))
 
 ###----------------------------------------------------------------------------------------------
 ###-------------------------------------Support Functions----------------------------------------
 ###----------------------------------------------------------------------------------------------
 
+##--------------------------------------get_auto_names-------------------------------------------------
+def get_auto_names(prefix, n_names):
+    """Constructs automatic numbered names for POIs or QOIs.
+    
+    Parameters
+    ----------
+    prefix : str
+        Text each name begins with, such as 'POI' or 'QOI'
+    n_names : int
+        Number of names to construct
+        
+    Returns
+    -------
+    np.ndarray
+        Array of strings prefix0, prefix1, ..., prefix(n_names-1)
+    """
+    # Fixed width unicode dtype avoids an intermediate list and object conversion
+    return np.fromiter((prefix + str(i_name) for i_name in range(n_names)),
+                       dtype='<U' + str(len(prefix) + len(str(max(n_names-1, 0)))),
+                       count=n_names)
+
+##--------------------------------------normalize_names------------------------------------------------
+def normalize_names(names, n_names, prefix):
+    """Checks user entered POI or QOI names and converts them to a numpy array.
+    
+    Parameters
+    ----------
+    names : np.ndarray, list, or str
+        User entered names or 'auto' to use automatic names
+    n_names : int
+        Number of POIs or QOIs being named
+    prefix : str
+        Either 'POI' or 'QOI', used for automatic names and error messages
+        
+    Returns
+    -------
+    np.ndarray
+        Array of n_names strings
+    """
+    if isinstance(names, (np.ndarray, list)):
+        names = np.asarray(names)
+        if names.size != n_names:
+            raise Exception("Incorrect number of entries in name_" + prefix.lower())
+    elif isinstance(names, str) and names.lower() != "auto":
+        if n_names != 1:
+            raise Exception("Only one " + prefix.lower() + " name entered for >1 " + prefix.lower() + "s")
+        names = np.array([names])
+    else:
+        if not isinstance(names, str):
+            warnings.warn("Unrecognized name_" + prefix.lower() + " entry, using automatic values")
+        names = get_auto_names(prefix, n_names)
+    return names
+
+##--------------------------------------normalize_dist_param-------------------------------------------
+def normalize_dist_param(dist_param, dist_type, n_poi, base_poi, cov):
+    """Checks user entered distribution parameters or constructs automatic ones.
+    
+    Parameters
+    ----------
+    dist_param : np.ndarray or str
+        2 x n_poi array of distribution parameters, 'auto', or 'cov'
+    dist_type : str
+        Sampling distribution of the POIs
+    n_poi : int
+        Number of POIs
+    base_poi : np.ndarray
+        Nominal POI values used for automatic parameters
+    cov : np.ndarray
+        n_poi x n_poi covariance matrix, or empty if not given
+        
+    Returns
+    -------
+    np.ndarray
+        2 x n_poi array of distribution parameters
+    """
+    # Apply manual distribution settings
+    if isinstance(dist_param, np.ndarray):
+        #Check dimensions of numpy array are correct
+        if dist_param.ndim != 2 or dist_param.shape[1] != n_poi:
+            raise Exception("Incorrect shape of dist_param. Given shape: "\
+                            + str(dist_param.shape) + ", desired shape: ... x n_poi")
+        # Correct number of parameters for each distribution
+        if dist_param.shape[0] != 2:
+            raise Exception("2 parameters per POI required for " + dist_type)
+        return dist_param
+    if not isinstance(dist_param, str):
+        raise Exception("Incorrect data-type for dist_param, use ndarray, 'auto', or 'cov'")
+    # Apply automatic distribution parameter settings
+    if dist_param.lower() == 'auto':
+        if dist_type in ("uniform", "saltelli uniform"):
+            #Outer product builds the 2 x n_poi bounds in a single allocation
+            return np.multiply.outer([.8, 1.2], base_poi)
+        elif dist_type in ("normal", "saltelli normal"):
+            if cov.size==0:
+                return np.multiply.outer([1, .2], base_poi)
+            #Use covariance variances if a covariance matrix is given
+            return np.stack((base_poi, np.diag(cov,k=0)))
+    elif dist_param.lower() == "cov":
+        if dist_type.lower() in ("normal", "saltelli normal"):
+            return np.stack((base_poi, np.diag(cov,k=0)))
+        raise Exception("Covariance based sampling only implemented for"\
+                        +"normal or saltelli normal distributions")
+    raise Exception("Incorrect data-type for dist_param, use ndarray, 'auto', or 'cov'")
+
 
 ##--------------------------------------GetSobol------------------------------------------------------
 # GSA Component Functions
@@ -389,18 +418,37 @@ def plot_gsa(model, sample_mat, eval_mat, options):
     options : Options
         Object of class Options holding run settings.
     """
+    import matplotlib.pyplot as plt
+    from matplotlib.figure import Figure
     #Reduce Sample number
     #plotPoints=range(0,int(sample_mat.shape[0]), int(sample_mat.shape[0]/plotOptions.n_points))
     #Make the number of sample points to survey
     plotPoints=np.linspace(start=0, stop=sample_mat.shape[0]-1, num=options.plot.n_points, dtype=int)
+    #Gather the surveyed points once so each subplot reads a contiguous column
+    samp_plot=np.ascontiguousarray(sample_mat[plotPoints])
+    eval_plot=np.ascontiguousarray(eval_mat[plotPoints])
+    #Only create figures through pyplot if they are displayed so no GUI backend
+    #   is initialized for figures that are only saved
+    if options.display:
+        new_figure = plt.figure
+    else:
+        new_figure = Figure
+    #Scatter markers are rasterized so vector outputs store one image per subplot
+    #   instead of a path for every plotted point
     #Plot POI-POI correlation and distributions
-    figure, axes=plt.subplots(nrows=model.n_poi, ncols= model.n_poi, squeeze=False)
+    figure = new_figure()
+    axes = figure.subplots(nrows=model.n_poi, ncols= model.n_poi, squeeze=False)
     for iPOI in range(0,model.n_poi):
+        #Remove unused upper triangle axes so they are never drawn
+        for jPOI in range(iPOI+1, model.n_poi):
+            figure.delaxes(axes[iPOI, jPOI])
         for jPOI in range(0,iPOI+1):
             if iPOI==jPOI:
-                n, bins, patches = axes[iPOI, jPOI].hist(sample_mat[:,iPOI], bins=41)
+                #Bin with numpy and draw as a single filled step artist rather than 41 bars
+                counts, bins = np.histogram(sample_mat[:,iPOI], bins=41)
+                axes[iPOI, jPOI].stairs(counts, bins, fill=True)
             else:
-                axes[iPOI, jPOI].plot(sample_mat[plotPoints,iPOI], sample_mat[plotPoints,jPOI],'b*')
+                axes[iPOI, jPOI].plot(samp_plot[:,iPOI], samp_plot[:,jPOI],'b*', rasterized=True)
             if jPOI==0:
                 axes[iPOI,jPOI].set_ylabel(model.name_poi[iPOI])
             if iPOI==model.n_poi-1:
@@ -409,16 +457,21 @@ def plot_gsa(model, sample_mat, eval_mat, options):
                 axes[iPOI,jPOI].set_ylabel('Instances')
     figure.tight_layout()
     if options.path:
-        plt.savefig(options.path+"POIcorrelation.png")
+        figure.savefig(options.path+"POIcorrelation.png")
 
     #Plot QOI-QOI correlationa and distributions
-    figure, axes=plt.subplots(nrows=model.n_qoi, ncols= model.n_qoi, squeeze=False)
+    figure = new_figure()
+    axes = figure.subplots(nrows=model.n_qoi, ncols= model.n_qoi, squeeze=False)
     for i_qoi in range(0,model.n_qoi):
+        #Remove unused upper triangle axes so they are never drawn
+        for j_qoi in range(i_qoi+1, model.n_qoi):
+            figure.delaxes(axes[i_qoi, j_qoi])
         for j_qoi in range(0,i_qoi+1):
             if i_qoi==j_qoi:
-                axes[i_qoi, j_qoi].hist([eval_mat[:,i_qoi]], bins=41)
+                counts, bins = np.histogram(eval_mat[:,i_qoi], bins=41)
+                axes[i_qoi, j_qoi].stairs(counts, bins, fill=True)
             else:
-                axes[i_qoi, j_qoi].plot(eval_mat[plotPoints,i_qoi], eval_mat[plotPoints,j_qoi],'b*')
+                axes[i_qoi, j_qoi].plot(eval_plot[:,i_qoi], eval_plot[:,j_qoi],'b*', rasterized=True)
             if j_qoi==0:
                 axes[i_qoi,j_qoi].set_ylabel(model.name_qoi[i_qoi])
             if i_qoi==model.n_qoi-1:
@@ -427,19 +480,20 @@ def plot_gsa(model, sample_mat, eval_mat, options):
                 axes[i_qoi,j_qoi].set_ylabel('Instances')
     figure.tight_layout()
     if options.path:
-        plt.savefig(options.path+"QOIcorrelation.png")
+        figure.savefig(options.path+"QOIcorrelation.png")
 
     #Plot POI-QOI correlation
-    figure, axes=plt.subplots(nrows=model.n_qoi, ncols= model.n_poi, squeeze=False)
+    figure = new_figure()
+    axes = figure.subplots(nrows=model.n_qoi, ncols= model.n_poi, squeeze=False)
     for i_qoi in range(0,model.n_qoi):
         for jPOI in range(0, model.n_poi):
-            axes[i_qoi, jPOI].plot(sample_mat[plotPoints,jPOI], eval_mat[plotPoints,i_qoi],'b*')
+            axes[i_qoi, jPOI].plot(samp_plot[:,jPOI], eval_plot[:,i_qoi],'b*', rasterized=True)
             if jPOI==0:
                 axes[i_qoi,jPOI].set_ylabel(model.name_qoi[i_qoi])
             if i_qoi==model.n_qoi-1:
                 axes[i_qoi,jPOI].set_xlabel(model.name_poi[jPOI])
     if options.path:
-        plt.savefig(options.path+"POI_QOIcorrelation.png")
+        figure.savefig(options.path+"POI_QOIcorrelation.png")
     #Display all figures
     if options.display:
         plt.show()
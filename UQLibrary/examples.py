@@ -5,7 +5,6 @@
 import UQLibrary as uq
 import numpy as np
 import math as math
-import scipy.integrate as integrate
 
 def GetExample(example, **kwargs):
     # Master function for selecting an example using a corresponding string
@@ -250,6 +249,7 @@ def HeatRod(params,x):
     T = c1*np.exp(-gx)+c2*np.exp(gx)+Tamb
     return T
 def SolveSIRinfected(params,y0,tEval):
+    import scipy.integrate as integrate
     if params.ndim==1:
         sol=integrate.solve_ivp(lambda t,y: SIRdydt(params,t,y), np.array([0, np.max(tEval)]),y0,t_eval=tEval)
         infected=sol.y[1,:]
@@ -263,6 +263,7 @@ def SolveSIRinfected(params,y0,tEval):
 
 
 def SIR_endemic_integrated(params,y0,tEval):
+    import scipy.integrate as integrate
     if params.ndim==1:
         sol=integrate.solve_ivp(lambda t,y: SIRdydt_endemic(params,t,y), np.array([0, np.max(tEval)]),y0,t_eval=tEval)
         recovered=sol.y[2,:]
@@ -9,14 +9,13 @@ Created on Tue Jan 18 14:03:35 2022
 import numpy as np
 #import sys
 import warnings
-from scipy.stats import qmc
-import scipy.stats as sct
+#scipy is imported lazily inside the saltelli samplers so it is only loaded for Sobol sampling
 
 import mpi4py.MPI as MPI
 
 class GsaOptions:
-    def __init__(self, run = True, run_sobol=True, run_morris=True, n_samp_sobol=100000, \
-                 n_samp_morris=4, l_morris=3):
+    def __init__(self, run = True, run_sobol=True, run_morris=True, n_samp_sobol=2**17, \
+                 n_samp_morris=4, l_morris=3, dtype=np.float64):
         self.run = run
         if self.run == False:
             self.run_sobol = False
@@ -27,6 +26,7 @@ class GsaOptions:
         self.n_samp_sobol = n_samp_sobol                      #Number of samples to be generated for GSA
         self.n_samp_morris = n_samp_morris
         self.l_morris=l_morris
+        self.dtype=dtype                                    #Float type Sobol samples and evaluations are stored in
         pass
 
 class GsaResults:
@@ -86,15 +86,16 @@ def run_gsa(model, gsa_options, logging = False):
         pert_distance = gsa_options.l_morris/ (2*(gsa_options.l_morris-1))
         
         #Create parameter sample only on thread 0 since it need not be parallelized
-        # initialize memory location on all threads
-        morris_samp = np.zeros((gsa_options.n_samp_morris*(model.n_poi+1), model.n_poi),dtype = float)
-        if logging > 1:
-            print("initialized morris_samp of size: " + str(morris_samp.shape))
         if mpi_rank == 0:
             if logging:
                 print("Generating Morris Sample")
             morris_samp = get_morris_poi_sample(model.sample_fcn, gsa_options.n_samp_morris,\
                                                 model.n_poi, pert_distance)
+        else:
+            # initialize memory location on other threads to receive the sample
+            morris_samp = np.empty((gsa_options.n_samp_morris*(model.n_poi+1), model.n_poi),dtype = float)
+            if logging > 1:
+                print("initialized morris_samp of size: " + str(morris_samp.shape))
         mpi_comm.Bcast([morris_samp,MPI.DOUBLE], root = 0)
                 
             
@@ -105,23 +106,24 @@ def run_gsa(model, gsa_options, logging = False):
         gsa_results.morris_mean = morris_mean
         gsa_results.morris_std=morris_std
 
-    #Sobol Analysis Un parallelized for now
-    if gsa_options.run_sobol and mpi_rank == 0:
-        if logging:
+    #Sobol Analysis
+    if gsa_options.run_sobol:
+        if logging and mpi_rank == 0:
             print("Generating Sobol Sample")
-        #Make Distribution Samples and Calculate model results
-        [f_a, f_b, f_ab, f_d, samp_d] = get_sobol_sample(model, gsa_options)
-        #Calculate Sobol Indices
-        if logging:
-            print("Calculating Sobol Sample")
-        [sobol_base, sobol_tot]=calculate_sobol(f_a, f_b, f_ab, f_d)
-        gsa_results.f_d=f_d
-        gsa_results.f_a=f_a
-        gsa_results.f_b=f_b
-        gsa_results.f_ab=f_ab
-        gsa_results.samp_d=samp_d
-        gsa_results.sobol_base=sobol_base
-        gsa_results.sobol_tot=sobol_tot
+        #Make Distribution Samples and Calculate model results on all threads
+        [f_a, f_b, f_ab, f_d, samp_d] = get_sobol_sample(model, gsa_options, logging = logging)
+        #Calculate Sobol Indices only on base thread
+        if mpi_rank == 0:
+            if logging:
+                print("Calculating Sobol Sample")
+            [sobol_base, sobol_tot]=calculate_sobol(f_a, f_b, f_ab, f_d)
+            gsa_results.f_d=f_d
+            gsa_results.f_a=f_a
+            gsa_results.f_b=f_b
+            gsa_results.f_ab=f_ab
+            gsa_results.samp_d=samp_d
+            gsa_results.sobol_base=sobol_base
+            gsa_results.sobol_tot=sobol_tot
         #------------broadcast gsa results to other threads--------------------
         
     return gsa_results
@@ -132,9 +134,15 @@ def run_gsa(model, gsa_options, logging = False):
 ###----------------------------------------------------------------------------------------------
 
 
-def get_sobol_sample(model,gsa_options):
+def get_sobol_sample(model,gsa_options, logging = False):
     """Constructs and evaluates sobol samples using predefined sampling distributions.
-        Currently only function for uniform or saltelli normal
+        Currently only function for uniform or saltelli normal. Samples are
+        drawn on thread 0 and model evaluations are split across all threads.
+        Samples are given to eval_fcn and evaluations are stored as
+        gsa_options.dtype. With float32 only the index reductions accumulate
+        in float64, the differences and products are formed from float32
+        evaluations, so float32 limits index precision, especially for a QOI
+        whose mean is large relative to its variance.
     
     Parameters
     ----------
@@ -142,6 +150,8 @@ def get_sobol_sample(model,gsa_options):
         Contaings simulation information.
     gsa_options : GSAOptions
         Contains run settings
+    logging : bool or int
+        Level of intermediate output to print
         
     Returns
     -------
@@ -162,33 +172,54 @@ def get_sobol_sample(model,gsa_options):
     #           warnings.warn("Non-satelli sampling algorithm used for Sobol analysis."\
     #                         + " Suggested distribution types are satelli normal "+\
     #                             "and satelli uniform.")
-    sample_compact = model.sample_fcn(2*n_samp_sobol)
-    f_compact = model.eval_fcn(sample_compact)
-    # Seperate sample into a and b for algorithm
-    samp_a = sample_compact[:n_samp_sobol]
-    samp_b = sample_compact[n_samp_sobol:]
-    f_a = f_compact[:n_samp_sobol]
-    f_b = f_compact[n_samp_sobol:] # n_samp_sobol x nQOI out matrix from B
+    #Load mpi details to keep track of thread number
+    mpi_comm = MPI.COMM_WORLD
+    mpi_rank = mpi_comm.Get_rank()
+    mpi_size = mpi_comm.Get_size()
+    
+    samp_shape = ((model.n_poi+2)*n_samp_sobol, model.n_poi)
+    #Create parameter sample only on thread 0 since it need not be parallelized
+    if mpi_rank == 0:
+        # Initialize memory location of stacked a, b, and mixed ab samples in the
+        #   storage type so eval_fcn is given samples of gsa_options.dtype
+        samp_all = np.empty(samp_shape, dtype=gsa_options.dtype)
+        sample_compact = model.sample_fcn(2*n_samp_sobol)
+        # Seperate sample into a and b for algorithm
+        samp_a = sample_compact[:n_samp_sobol]
+        samp_b = sample_compact[n_samp_sobol:]
+        # Stack a, b, and each mixed sample ab so that a single eval_fcn call is required
+        samp_all[:2*n_samp_sobol] = sample_compact
+        # Define each samp_ab[i] to be A with the ith parameter in B
+        samp_ab = samp_all[2*n_samp_sobol:].reshape(model.n_poi, n_samp_sobol, model.n_poi)
+        samp_ab[:] = samp_a
+        samp_ab[np.arange(model.n_poi), :, np.arange(model.n_poi)] = samp_b.transpose()
+    else:
+        #Other threads receive only their rows in parallel_eval, which reads just
+        #   the shape and dtype of the full sample, so give them a zero-stride placeholder
+        samp_all = np.broadcast_to(np.empty(1, dtype=gsa_options.dtype), samp_shape)
+    sample_compact = samp_all[:2*n_samp_sobol]
+    
+    if logging and mpi_rank == 0:
+        print("Evaulating Sobol Sample")
+    if mpi_size == 1:
+        f_all = model.eval_fcn(samp_all)
+    else:
+        f_all = parallel_eval(model.eval_fcn, samp_all, logging = logging)
+    f_all = np.asarray(f_all, dtype=gsa_options.dtype)
+    f_a = f_all[:n_samp_sobol]
+    f_b = f_all[n_samp_sobol:2*n_samp_sobol] # n_samp_sobol x nQOI out matrix from B
     # Stack the output matrices into a single matrix
-    f_d = np.concatenate((f_a.copy(), f_b.copy()), axis=0)
+    f_d = f_all[:2*n_samp_sobol]
 
-    # Initialize combined QOI sample matrices
+    # Unstack mixed evaluations into n_samp_sobol x nPOI (x nQOI) array
     if model.n_qoi == 1:
-        f_ab = np.empty([n_samp_sobol, model.n_poi])
+        f_ab = f_all[2*n_samp_sobol:].reshape(model.n_poi, n_samp_sobol).transpose()
     else:
-        f_ab = np.empty([n_samp_sobol, model.n_poi, model.n_qoi])
-    for i_param in range(0, model.n_poi):
-        # Define sampC to be A with the ith parameter in B
-        samp_ab = samp_a.copy()
-        samp_ab[:, i_param] = samp_b[:, i_param].copy()
-        if model.n_qoi == 1:
-            f_ab[:, i_param] = model.eval_fcn(samp_ab).squeeze()
-        else:
-            f_ab[:, i_param, :] = model.eval_fcn(samp_ab)  # n_samp_sobol x nPOI x nQOI tensor
-        del samp_ab
+        f_ab = f_all[2*n_samp_sobol:].reshape(model.n_poi, n_samp_sobol, model.n_qoi)\
+            .transpose(1, 0, 2)
     return f_a, f_b, f_ab, f_d, sample_compact
 
-def calculate_sobol(f_a, f_b, f_ab, f_d):
+def calculate_sobol(f_a, f_b, f_ab, f_d = None):
     """Calculates 1st order and total sobol indices using Saltelli approximation formula.
     
     Parameters
@@ -199,8 +230,10 @@ def calculate_sobol(f_a, f_b, f_ab, f_d):
         n_samp_sobol x n_qoi array of evaluations of Sobol sample part b
     f_ab : np.ndarray
         n_samp_sobol x n_qoi array x n_poi array of evaluations of mixed Sobol sample ab
-    f_d : np.ndarray
-        2*n_samp_sobol x n_qoi array of concatenated evaluations of part a and b
+    f_d : np.ndarray, optional
+        2*n_samp_sobol x n_qoi array of concatenated evaluations of part a and b.
+        If not given, the QOI variance is pooled from f_a and f_b without
+        concatenating them
     
         
     Returns
@@ -226,25 +259,39 @@ def calculate_sobol(f_a, f_b, f_ab, f_d):
     else:
         raise(Exception('f_ab has greater than 3 dimensions, make sure f_ab is' \
                         'the squeezed form of n_samp_sobol x nPOI x nQOI'))
-    #QOI variance
-    fDvar=np.var(f_d, axis=0)
-
-    sobol_base=np.empty((n_qoi, n_poi))
-    sobol_tot=np.empty((n_qoi, n_poi))
-    if n_qoi==1:
-        #Calculate 1st order parameter effects
-        sobol_base=np.mean(f_b*(f_ab-f_a), axis=0)/(fDvar)
-
-        #Caclulate 2nd order parameter effects
-        sobol_tot=np.mean((f_a-f_ab)**2, axis=0)/(2*fDvar)
-
+    n_samp = f_ab.shape[0]
+    #View evaluations as n_samp x n_qoi and n_samp x n_poi x n_qoi so all QOIs are
+    #   computed together
+    f_a = f_a.reshape(n_samp, n_qoi)
+    f_b = f_b.reshape(n_samp, n_qoi)
+    #QOI variance, reductions are accumulated in float64 regardless of storage type
+    if f_d is None:
+        #Variance of a and b combined is the average of their variances plus the
+        #   spread of their means
+        fDvar = (np.var(f_a, axis=0, dtype=np.float64) + np.var(f_b, axis=0, dtype=np.float64))/2\
+            + (np.mean(f_a, axis=0, dtype=np.float64) - np.mean(f_b, axis=0, dtype=np.float64))**2/4
     else:
-        for iQOI in range(0,n_qoi):
-            #Calculate 1st order parameter effects
-            sobol_base[iQOI,:]=np.mean(f_b[:,[iQOI]]*(f_ab[:,:,iQOI]-f_a[:,[iQOI]]),axis=0)/fDvar[iQOI]
-            #Caclulate 2nd order parameter effects
-            sobol_tot[iQOI,:]= np.mean((f_a[:,[iQOI]]-f_ab[:,:,iQOI])**2,axis=0)/(2*fDvar[iQOI])
-
+        fDvar=np.var(f_d, axis=0, dtype=np.float64).reshape(n_qoi)
+    f_ab = f_ab.reshape(n_samp, n_poi, n_qoi)
+    #Both estimators share the same difference so it is only formed once, the
+    #   products and sums over samples are then fused by einsum. Samples are
+    #   reduced in blocks of about 2^18 differences so each block of f_diff stays
+    #   in cache between the two sums instead of streaming a full N x P x Q array
+    n_block = max(1, 2**18//(n_poi*n_qoi))
+    sobol_base = np.zeros((n_qoi, n_poi))
+    sobol_tot = np.zeros((n_qoi, n_poi))
+    for i_start in range(0, n_samp, n_block):
+        block = slice(i_start, i_start + n_block)
+        f_diff = f_ab[block] - f_a[block, np.newaxis, :]
+        #Sum 1st order parameter effects
+        sobol_base += np.einsum('nq,npq->qp', f_b[block], f_diff, dtype=np.float64)
+        #Sum total parameter effects
+        sobol_tot += np.einsum('npq,npq->qp', f_diff, f_diff, dtype=np.float64)
+    sobol_base /= n_samp*fDvar[:, np.newaxis]
+    sobol_tot /= 2*n_samp*fDvar[:, np.newaxis]
+    if n_qoi==1:
+        sobol_base = sobol_base.reshape(n_poi)
+        sobol_tot = sobol_tot.reshape(n_poi)
 
     return sobol_base, sobol_tot
 #==============================================================================
@@ -328,34 +375,31 @@ def calculate_morris(eval_fcn, morris_samp, pert_distance, logging = False):
         if logging > 1:
             print("poi_pert_location: " + str(poi_pert_location))
             
-            
-        #initialize data storage arrays with 1 dimension lower if n_qoi =1
-        if n_qoi > 1:
-            deriv_approx = np.empty((n_samp, n_poi, n_qoi))  # n_samp x n_poi x n_qoi
-        else: 
-            deriv_approx = np.empty((n_samp, n_poi))  # n_samp x n_poi
         if logging >1:
             print("QOIs : " + str(f_eval_seperated))
         
-        #Apply finite difference formula 
+        #Apply finite difference formula to every sample at once
         #Source: Smith, R. 2011, Uncertainty Quanitification. p.333
         if logging > 0:
             print("Calculating Morris indices")
-        for i_samp in range(n_samp):
-            for i_pert in range(n_poi): 
-                i_poi = poi_pert_location[i_samp, i_pert]
-                deriv_approx[i_samp,i_poi] = (f_eval_seperated[i_samp,i_pert+1] - \
-                                              f_eval_seperated[i_samp,i_pert])/ pert_distance
-        # for i_poi in range(n_poi):
-        #     deriv_approx[:,i_poi] = f_eval_seperated[:,i_poi+1] - f_eval_seperated[:,i_poi]
+        f_diff = np.diff(f_eval_seperated, axis = 1)
+        #Store each difference under the poi its step perturbed, then divide the
+        #   float array in place so integer QOIs are not divided in their own dtype
+        deriv_approx = np.empty(f_diff.shape)  # n_samp x n_poi (x n_qoi)
+        deriv_approx[np.arange(n_samp)[:, np.newaxis], poi_pert_location] = f_diff
+        deriv_approx /= pert_distance
         if logging > 1:
             print("deriv approx: " + str(deriv_approx))
             
         #Apply Morris Index formulas
         #Source: Smith, R. 2011, Uncertainty Quanitification. p.332
-        morris_mean_abs = np.mean(np.abs(deriv_approx),axis = 0) # n_poi x n_qoi
         morris_mean = np.mean(deriv_approx, axis = 0)
-        morris_std=np.sqrt(np.var(deriv_approx, axis=0)) # n_poi x n_qoi
+        #Reuse the mean for the deviations rather than letting np.var recompute it,
+        #   the squared deviations are then summed by einsum without a temporary
+        deriv_dev = deriv_approx - morris_mean
+        morris_std=np.sqrt(np.einsum('i...,i...->...', deriv_dev, deriv_dev)/n_samp) # n_poi x n_qoi
+        #deriv_approx is no longer needed so its absolute value is taken in place
+        morris_mean_abs = np.mean(np.abs(deriv_approx, out = deriv_approx),axis = 0) # n_poi x n_qoi
         
         if logging > 1:
             print("morris mean abs: " + str(morris_mean_abs))
@@ -373,58 +417,61 @@ def calculate_morris(eval_fcn, morris_samp, pert_distance, logging = False):
     return morris_mean_abs, morris_mean, morris_std
 
 def morris_seperate(qoi_compact, n_samp, n_poi, n_qoi):
+    #Seperate each parameter search for ease of computation
     if n_qoi > 1:
-        qoi_seperated = np.empty((n_samp, n_poi+1, n_qoi))
+        qoi_seperated = qoi_compact.reshape(n_samp, n_poi+1, n_qoi)
     else: 
-        qoi_seperated = np.empty((n_samp, n_poi+1))
-    #Seperate each parameter search for ease of computation
-    for i_samp in range(n_samp):
-        qoi_seperated[i_samp] = qoi_compact[i_samp*(n_poi+1):(i_samp+1)*(n_poi+1)].squeeze()
+        qoi_seperated = qoi_compact.reshape(n_samp, n_poi+1)
         
     return qoi_seperated
 
 def get_poi_pert_location(morris_samp_seperate):
     n_samp = morris_samp_seperate.shape[0]
-    n_poi = morris_samp_seperate.shape[2]
-    poi_pert_location = np.empty((n_samp, n_poi))
-    for i_samp in range(n_samp):
-        for i_poi in range(n_poi):
-            poi_pert_location[i_samp,i_poi] = np.argmax(np.abs(morris_samp_seperate[i_samp,i_poi+1] \
-                                          - morris_samp_seperate[i_samp,i_poi]))
-    return poi_pert_location.astype(int)
+    n_poi = morris_samp_seperate.shape[1]-1
+    #Each step perturbs the poi with the largest change from the previous row
+    step = np.diff(morris_samp_seperate.reshape(n_samp, n_poi+1, n_poi), axis = 1)
+    poi_pert_location = np.argmax(np.abs(step), axis = 2)
+    return poi_pert_location
 ##---------------------------get_morris_poi_sample-----------------------------
 
 def get_morris_poi_sample(param_dist, n_samp, n_poi, pert_distance, random = False):
     #Use sobol distributions for low discrepancy
     #Generate n_samp_morris samples
     random_samp =  param_dist(n_samp)
-    #Define Sampling matrices that are constant
-    J=np.ones((n_poi+1,n_poi))
-    B = (np.tril(np.ones(J.shape), -1))
-    morris_samp_compact = np.empty((n_samp*(n_poi+1), n_poi))
-    for i_samp in range(n_samp):
-        jTheta=random_samp[i_samp,]*J
-        #Calculate Morris Sample matrix
-        #Source: Smith, R. 2011. Uncertainty Quantification. p.334
-        if random == True:  
-            #Define Random Sampling matrices
-            #D=np.diag(np.random.choice(np.array([1,-1]), size=(n_poi,)))
-            #NOTE: using non-random step direction to keep denominator in deriv approx
-            #   equal to delta rather than -delta for some samples. Random form is
-            #   kept above in comments 
-            D=np.diag(np.random.choice(np.array([1,1]), size=(n_poi,)))
-            P=np.identity(n_poi)
-            np.random.shuffle(P)
-            samp_mat = np.matmul(jTheta+pert_distance/2*(np.matmul((2*B-J),D)+J),P)
-        elif random == False:
-            #Define non-random Sampling matrices
-            D=np.diag(np.random.choice(np.array([1,1]), size=(n_poi,)))
-            P=np.identity(n_poi)
-            np.random.shuffle(P)
-            # Only use non-random formulations for testing matrix generation
-            samp_mat = jTheta+pert_distance/2*(np.matmul((2*B-J),D)+J)
-        #Stack each grid seach so that a single eval_fcn call is required
-        morris_samp_compact[i_samp*(n_poi+1):(i_samp+1)*(n_poi+1),:] = samp_mat
+    #Define Sampling matrix that is constant, J is all ones so 2B-J is formed
+    #   directly as 2B-1 without allocating J
+    B = np.tril(np.ones((n_poi+1, n_poi)), -1)
+    step_dir = 2*B - 1
+    #Calculate all Morris Sample matrices at once, stacked along the first axis
+    #Source: Smith, R. 2011. Uncertainty Quantification. p.334
+    #Define step directions, the diagonal of D, for each sample
+    #D_diag=np.random.choice(np.array([1,-1]), size=(n_samp, 1, n_poi))
+    #NOTE: using non-random step direction to keep denominator in deriv approx
+    #   equal to delta rather than -delta for some samples. Random form is
+    #   kept above in comments. With every direction +1, (2B-J)D is just (2B-J)
+    #   so D is not formed or multiplied in. If the random form is restored,
+    #   multiply samp_mat by the permuted D_diag before adding J below
+    if random == True:
+        #Apply a random column permutation, P, to each sample matrix as an index
+        #   vector rather than multiplying by a shuffled identity matrix
+        perm = np.argsort(np.random.rand(n_samp, n_poi), axis = 1)
+        #Permuting the columns of jTheta+pert_distance/2*((2B-J)D+J) is the same
+        #   as permuting the columns of each term, so gather the permuted columns
+        #   of (2B-J) into the output buffer
+        samp_mat = step_dir[np.arange(n_poi+1)[:, np.newaxis], perm[:, np.newaxis, :]]
+        base_samp = np.take_along_axis(random_samp, perm, axis = 1)
+    else:
+        # Only use non-random formulations for testing matrix generation
+        #P is the identity, so copy (2B-J) into every sample without a gather
+        samp_mat = np.empty((n_samp, n_poi+1, n_poi))
+        samp_mat[:] = step_dir
+        base_samp = random_samp
+    samp_mat += 1
+    samp_mat *= pert_distance/2
+    #Broadcast each base sample over its n_poi+1 rows rather than multiplying by J
+    samp_mat += base_samp[:, np.newaxis, :]
+    #Stack each grid seach so that a single eval_fcn call is required
+    morris_samp_compact = samp_mat.reshape(n_samp*(n_poi+1), n_poi)
     return morris_samp_compact
 
 #======================================================================================================
@@ -465,26 +512,28 @@ def parallel_eval(eval_fcn, poi_sample, logging = False):
                     else:
                         data_broadcast = poi_sample[(i_rank*samp_per_subsample):((i_rank+1)*samp_per_subsample)]
                     mpi_comm.send(data_broadcast.shape, dest = i_rank, tag = 0)
-                    mpi_comm.Send([data_broadcast,MPI.DOUBLE],dest = i_rank, tag = 1)
+                    mpi_comm.Send(np.ascontiguousarray(data_broadcast),dest = i_rank, tag = 1)
                     #print("poi_subsample sent to thread " + str(i_rank) + ": " + str(data_broadcast))
     else:
         data_shape = mpi_comm.recv(source = 0, tag = 0)
-        data = np.empty(data_shape)
+        data = np.empty(data_shape, dtype = poi_sample.dtype)
         mpi_comm.Recv(data,source=0, tag=1)
                 
     
     # Evaluate each subsamples
     qoi_subsample = eval_fcn(data)
     mpi_comm.Barrier()
+    #Keep the sample precision so float32 samples are not promoted in transfer
+    qoi_subsample = np.ascontiguousarray(qoi_subsample, dtype = np.result_type(poi_sample.dtype, np.float32))
     if qoi_subsample.ndim == 2:
-        qoi_sample = np.zeros((poi_sample.shape[0], qoi_subsample.shape[1]), dtype = float)
+        qoi_sample = np.zeros((poi_sample.shape[0], qoi_subsample.shape[1]), dtype = qoi_subsample.dtype)
     else:
-        qoi_sample = np.zeros((poi_sample.shape[0]), dtype = float)
+        qoi_sample = np.zeros((poi_sample.shape[0]), dtype = qoi_subsample.dtype)
     #print(poi_reconstructed)
 
     if mpi_rank > 0:
         mpi_comm.send(qoi_subsample.shape, dest = 0, tag = 0)
-        mpi_comm.Send([qoi_subsample, MPI.DOUBLE], dest = 0, tag =1)
+        mpi_comm.Send(qoi_subsample, dest = 0, tag =1)
         #print("sending data from thread " + str(mpi_rank) + ": " + str(data))
     elif mpi_rank ==0 :
         total_samp=0
@@ -505,7 +554,7 @@ def parallel_eval(eval_fcn, poi_sample, logging = False):
             total_samp += n_samp 
             
     # Send back out qoi_sample so all threads have a return
-    mpi_comm.Bcast([qoi_sample, MPI.DOUBLE], root = 0)
+    mpi_comm.Bcast(qoi_sample, root = 0)
     
     
     return qoi_sample
@@ -533,23 +582,37 @@ def get_samp_dist(dist_type, dist_param, n_poi, fcn_inverse_cdf = np.nan):
         model object with added sample function
     """
     # Determine Sample Function- Currently only 1 distribution type can be defined for all parameters
+    # Location and scale are fixed for the model, so compute them once here rather
+    # than re-indexing dist_param on every draw
     if dist_type == 'normal':  # Normal Distribution
-        sample_fcn = lambda n_samp_sobol: np.random.randn(n_samp_sobol, n_poi)*\
-            np.sqrt(dist_param[[1], :]) + dist_param[[0], :]
+        loc = np.array(dist_param[0], dtype=float)
+        scale = np.sqrt(dist_param[1])
+        def sample_fcn(n_samp_sobol):
+            #Scale and shift the draw in place so only the output array is allocated
+            sample = np.random.randn(n_samp_sobol, n_poi)
+            sample *= scale
+            sample += loc
+            return sample
     elif dist_type == 'saltelli normal':
         sample_fcn = lambda n_samp_sobol: saltelli_normal(n_samp_sobol, dist_param)
     elif dist_type == 'uniform':  # uniform distribution
         # doubleParms=np.concatenate(model.dist_param, model.dist_param, axis=1)
-        sample_fcn = lambda n_samp_sobol: np.random.rand(n_samp_sobol, n_poi)*\
-            (dist_param[[1], :]-dist_param[[0],:]) + dist_param[[0], :]
+        loc = np.array(dist_param[0], dtype=float)
+        scale = dist_param[1] - dist_param[0]
+        def sample_fcn(n_samp_sobol):
+            sample = np.random.rand(n_samp_sobol, n_poi)
+            sample *= scale
+            sample += loc
+            return sample
     elif dist_type == 'saltelli uniform':  # uniform distribution
         # doubleParms=np.concatenate(model.dist_param, model.dist_param, axis=1)
         sample_fcn = lambda n_samp_sobol: saltelli_uniform(n_samp_sobol, dist_param)
     elif dist_type == 'exponential': # exponential distribution
         sample_fcn = lambda n_samp_sobol: np.random.exponential(dist_param,size=(n_samp_sobol, n_poi))
     elif dist_type == 'beta': # beta distribution
-        sample_fcn = lambda n_samp_sobol:np.random.beta(dist_param[[0],:], dist_param[[1],:],\
-                                               size=(n_samp_sobol, n_poi))
+        alpha = np.array(dist_param[0], dtype=float)
+        beta = np.array(dist_param[1], dtype=float)
+        sample_fcn = lambda n_samp_sobol:np.random.beta(alpha, beta, size=(n_samp_sobol, n_poi))
     elif dist_type == 'InverseCDF': #Arbitrary distribution given by inverse cdf
         if fcn_inverse_cdf == np.nan:
             raise Exception("InverseCDF distribution selected but no function provided.")
@@ -568,10 +631,10 @@ def saltelli_sample(n_samp, n_poi):
     
     Parameters
     ----------
-    n_samp_sobol : int
+    n_samp : int
         Number of samples to take
-    dist_param : np.ndarray
-        2 x n_poi array of min and max sampling bounds for each parameter
+    n_poi : int
+        Number of parameters to sample
         
     Returns
     -------
@@ -580,26 +643,26 @@ def saltelli_sample(n_samp, n_poi):
         using satelli's alrogrithm
     """
     
-    #Add .5 to n_samp/2 so that if n_samp is odd, an extra sample is generated
+    from scipy.stats import qmc
     sampler = qmc.Sobol(d= n_poi*2, scramble = True)
-    #Use the smallest log2 sample size at least as large as n_samp to keep
+    #Draw ceil(n_samp/2) points so that if n_samp is odd, an extra sample is generated
+    n_half = (n_samp+1)//2
+    #Use the smallest log2 sample size at least as large as n_half to keep
     #   quadrature balance 
     #   (see https://scipy.github.io/devdocs/reference/generated/scipy.stats.qmc.Sobol.html )
-    base_sample = sampler.random_base2(m=int(np.ceil(np.log2(n_samp/2))))
-    
-    #Add .5 to n_samp/2 so that if n_samp is odd, an extra sample is generated
-    base_sample=base_sample[:int(n_samp/2+.5),:]
+    m_base = max(int(np.ceil(np.log2(n_half))), 0)
+    if 2**m_base != n_half:
+        warnings.warn("Saltelli sample of " + str(n_samp) + " points uses " + str(n_half)
+                      + " of " + str(2**m_base) + " Sobol points. Request twice a power of 2 "
+                      + "samples to keep the balance properties of the sequence.")
+    base_sample = sampler.random_base2(m=m_base)[:n_half]
     
     sample = np.empty((n_samp, n_poi))
     
     #Seperate and stack half the samples in the 2nd dimension for saltelli's 
-    # algorithm
-    if n_samp%2==0:
-        sample[:int((n_samp)/2),:]=base_sample[:,0:n_poi]
-        sample[int((n_samp)/2):,:]=base_sample[:,n_poi:]
-    else :
-        sample[:int((n_samp+.5)/2),:] = base_sample[:,0:n_poi]
-        sample[int((n_samp+.5)/2):-1,:] = base_sample[:,n_poi:]
+    # algorithm, dropping the extra point's 2nd half when n_samp is odd
+    sample[:n_half] = base_sample[:, :n_poi]
+    sample[n_half:] = base_sample[:n_samp-n_half, n_poi:]
     return sample
 
 
@@ -622,9 +685,11 @@ def saltelli_uniform(n_samp, dist_param):
     """
     n_poi=dist_param.shape[1]
     
-    sample_base = saltelli_sample(n_samp,n_poi)
+    sample_transformed = saltelli_sample(n_samp,n_poi)
     
-    sample_transformed = dist_param[[0],:]+(dist_param[[1],:]-dist_param[[0],:])*sample_base
+    #Scale and shift the unit sample in place rather than allocating new arrays
+    sample_transformed *= dist_param[1]-dist_param[0]
+    sample_transformed += dist_param[0]
     return sample_transformed
 
 
@@ -646,9 +711,13 @@ def saltelli_normal(n_samp, dist_param):
         satelli's alrogrithm
     """
     
+    #ndtri is the inverse normal cdf that scipy.stats.norm.ppf dispatches to
+    from scipy.special import ndtri
     n_poi=dist_param.shape[1]
     
-    sample_base = saltelli_sample(n_samp,n_poi)
-    sample_transform=sct.norm.ppf(sample_base)*np.sqrt(dist_param[[1], :]) \
-        + dist_param[[0], :]
+    sample_transform = saltelli_sample(n_samp,n_poi)
+    #Transform, scale and shift the unit sample in place rather than allocating new arrays
+    ndtri(sample_transform, out = sample_transform)
+    sample_transform *= np.sqrt(dist_param[1])
+    sample_transform += dist_param[0]
     return sample_transform
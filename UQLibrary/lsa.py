@@ -11,17 +11,16 @@ import sys
 #import matplotlib.pyplot as plt
 #import scipy.integrate as integrate
 #from tabulate import tabulate                       #Used for printing tables to terminal
-#import sobol                                        #Used for generating sobol sequences
-#import SALib.sample as sample
 #import scipy.stats as sct
 
 class LsaOptions:
     def __init__(self,run=True, run_param_subset=True, x_delta=10**(-12),\
-                 method='complex', scale='y', subset_rel_tol=.001):
+                 method='complex', scale='y', subset_rel_tol=.001, vectorize=False):
         self.run=run                              #Whether to run lsa (True or False)
         self.x_delta=x_delta                        #Input perturbation for calculating jacobian
         self.scale=scale                          #scale can be y, n, or both for outputing scaled, unscaled, or both
         self.method=method                        #method used for approximating derivatives
+        self.vectorize=vectorize                  #Whether eval_fcn accepts an n_samp x n_poi array of POIs
         if self.run == False:
             self.run_param_subset = False
         else:
@@ -75,10 +74,12 @@ def run_lsa(model, lsa_options):
 
     # Calculate Jacobian
     jac_raw=get_jacobian(model.eval_fcn, model.base_poi, lsa_options.x_delta,\
-                         lsa_options.method, scale=False, y_base=model.base_qoi)
+                         lsa_options.method, scale=False, y_base=model.base_qoi,\
+                         vectorize=lsa_options.vectorize)
     # Calculate relative sensitivity index (RSI)
     jac_rsi=get_jacobian(model.eval_fcn, model.base_poi, lsa_options.x_delta,\
-                         lsa_options.method, scale=True, y_base=model.base_qoi)
+                         lsa_options.method, scale=True, y_base=model.base_qoi,\
+                         vectorize=lsa_options.vectorize)
     # Calculate Fisher Information Matrix from jacobian
     fisher_mat=np.dot(np.transpose(jac_raw), jac_raw)
 
@@ -115,6 +116,9 @@ def get_jacobian(eval_fcn, x_base, x_delta, method, **kwargs):
         Whether or not to apply relative scaling of POI and QOI
     **y_base : np.ndarray
         QOI values used in finite difference approximation, saves a function evaluation
+    **vectorize : bool
+        Whether eval_fcn accepts an n_poi x n_poi array of POIs, in which case all
+        perturbed POIs are evaluated in a single eval_fcn call
         
     Returns
     -------
@@ -128,6 +132,12 @@ def get_jacobian(eval_fcn, x_base, x_delta, method, **kwargs):
             raise Exception("Non-boolean value provided for 'scale' ")      # Stop compiling if not
     else:
         scale = False                                                       # Function defaults to no scaling
+    if 'vectorize' in kwargs:                                               # Determine whether to evaluate all
+        vectorize = kwargs["vectorize"]                                     #   perturbations in one eval_fcn call
+        if not isinstance(vectorize, bool):                                 # Check vectorize value is boolean
+            raise Exception("Non-boolean value provided for 'vectorize' ")
+    else:
+        vectorize = False
     if 'y_base' in kwargs:
         y_base = eval_fcn(x_base)
         #y_base = kwargs["y_base"]
@@ -167,6 +177,25 @@ def get_jacobian(eval_fcn, x_base, x_delta, method, **kwargs):
     n_poi = np.size(x_base)
     n_qoi = np.size(y_base)
 
+    if vectorize:
+        # Stack each perturbed POI vector as a row so a single eval_fcn call is required
+        if method.lower()== 'complex':
+            x_pert = np.tile(x_base + 0j, (n_poi, 1))                          # Initialize Complex Perturbed inputs
+            x_pert[np.arange(n_poi), np.arange(n_poi)] += x_delta * 1j          # Add complex Step in each input
+        elif method.lower() == 'finite':
+            x_pert = np.tile(x_base.astype(float), (n_poi, 1))
+            x_pert[np.arange(n_poi), np.arange(n_poi)] += x_delta
+        y_pert = np.reshape(eval_fcn(x_pert), (n_poi, n_qoi)).transpose()    # n_qoi x n_poi perturbed outputs
+        y_base = np.reshape(y_base, (n_qoi, 1))
+        if method.lower()== 'complex':
+            jac = np.imag(y_pert / x_delta)                                   # Estimate Derivative w/ 2nd order complex
+        elif method.lower() == 'finite':
+            jac = (y_pert - y_base) / x_delta
+        #Only Scale Jacobian if 'scale' value is passed True in function call
+        if scale:
+            jac *= x_base * np.sign(y_base) / (sys.float_info.epsilon + y_base)
+        return jac
+
     jac = np.empty(shape=(n_qoi, n_poi), dtype=float)                       # Define Empty Jacobian Matrix
 
     for i_poi in range(0, n_poi):                                            # Loop through POIs
@@ -218,7 +247,8 @@ def get_active_subset(model,lsa_options):
     inactive_index=np.zeros(model.n_poi)
     #Calculate Jacobian
     jac=get_jacobian(model.eval_fcn, model.base_poi, lsa_options.x_delta,\
-                         lsa_options.method, scale=False, y_base=model.base_qoi)
+                         lsa_options.method, scale=False, y_base=model.base_qoi,\
+                         vectorize=lsa_options.vectorize)
     while eliminate:
         #Caclulate Fisher
         fisher_mat=np.dot(np.transpose(jac), jac)
@@ -10,6 +10,8 @@ Created on Wed Feb  9 10:45:11 2022
 import numpy as np
 import sys
 import random
+import warnings
+import pytest
 
 #Load Load functions to be tested
 sys.path.insert(0, '../')
@@ -18,6 +20,10 @@ from gsa import saltelli_sample
 from gsa import get_samp_dist
 from gsa import morris_seperate
 from gsa import calculate_morris
+from gsa import calculate_sobol
+from gsa import get_sobol_sample
+from gsa import GsaOptions
+from types import SimpleNamespace
 
 #==============================================================================
 #------------------------------Morris Calculations-----------------------------
@@ -77,6 +83,115 @@ def test_morris_artificial_linear():
            & np.all(morris_mean[:,0] == coeff) & np.all(morris_mean[:,1] == -coeff)
     
 
+#Check models returning integer QOIs give float elementary effects
+def test_morris_integer_qoi():
+    n_poi = 3
+    param_dist = lambda n_samp : np.zeros((n_samp,n_poi))
+    n_samp = 4
+    delta = 1/2
+    coeff = np.arange(0,n_poi)
+    
+    #Integer output that changes by coeff for each full step
+    eval_fcn = lambda pois:  np.sum(2*pois*coeff, axis = 1).astype(int)
+    
+    sample = get_morris_poi_sample(param_dist, n_samp, n_poi, delta, \
+                                  random = True)
+    (morris_mean_abs, morris_mean, morris_std) = calculate_morris(eval_fcn, \
+                                                                  sample, \
+                                                                  delta)
+    assert np.all(morris_mean_abs == 2*coeff) and np.all(morris_std == 0)
+    
+#==============================================================================
+#------------------------------Sobol Calculations------------------------------
+#==============================================================================
+#Check the pooled variance used without f_d matches the concatenated variance
+def test_sobol_pooled_variance():
+    np.random.seed(10)
+    n_samp = 1000
+    n_poi = 3
+    n_qoi = 2
+    f_a = np.random.rand(n_samp, n_qoi)
+    f_b = 2*np.random.rand(n_samp, n_qoi) + 1
+    f_ab = np.random.rand(n_samp, n_poi, n_qoi)
+    f_d = np.concatenate((f_a, f_b), axis = 0)
+    
+    (sobol_base, sobol_tot) = calculate_sobol(f_a, f_b, f_ab, f_d)
+    (sobol_base_pooled, sobol_tot_pooled) = calculate_sobol(f_a, f_b, f_ab)
+    
+    assert np.allclose(sobol_base, sobol_base_pooled) and np.allclose(sobol_tot, sobol_tot_pooled)
+    
+#Check the single stacked evaluation is split back into f_a, f_b, and f_ab
+def test_sobol_sample_unstacking():
+    n_samp = 8
+    n_poi = 3
+    for n_qoi in (1, 2):
+        #Deterministic sample with a distinct value in every entry
+        sample_fcn = lambda n: np.arange(n*n_poi, dtype = float).reshape(n, n_poi)
+        weights = np.arange(1, n_poi*n_qoi + 1, dtype = float).reshape(n_poi, n_qoi)**2
+        eval_fcn = lambda pois: np.squeeze(pois @ weights, axis = -1) if n_qoi == 1 \
+            else pois @ weights
+        model = SimpleNamespace(n_poi = n_poi, n_qoi = n_qoi, sample_fcn = sample_fcn, \
+                                eval_fcn = eval_fcn)
+        gsa_options = GsaOptions(n_samp_sobol = n_samp)
+        
+        (f_a, f_b, f_ab, f_d, sample_compact) = get_sobol_sample(model, gsa_options)
+        
+        samp_a = sample_fcn(2*n_samp)[:n_samp]
+        samp_b = sample_fcn(2*n_samp)[n_samp:]
+        assert np.array_equal(sample_compact, np.concatenate((samp_a, samp_b)))
+        assert np.array_equal(f_a, eval_fcn(samp_a))
+        assert np.array_equal(f_b, eval_fcn(samp_b))
+        assert np.array_equal(f_d, eval_fcn(sample_compact))
+        for i_poi in range(n_poi):
+            samp_ab = samp_a.copy()
+            samp_ab[:, i_poi] = samp_b[:, i_poi]
+            assert np.array_equal(f_ab[:, i_poi], eval_fcn(samp_ab))
+    
+#Check each block of the stacked sample after [A; B] is A with one column from B
+def test_sobol_sample_ab_layout():
+    n_samp = 8
+    n_poi = 4
+    sample_fcn = lambda n: np.arange(n*n_poi, dtype = float).reshape(n, n_poi)
+    #Record the stacked sample eval_fcn is given
+    eval_input = []
+    def eval_fcn(pois):
+        eval_input.append(pois.copy())
+        return np.sum(pois, axis = 1)
+    model = SimpleNamespace(n_poi = n_poi, n_qoi = 1, sample_fcn = sample_fcn, \
+                            eval_fcn = eval_fcn)
+    
+    get_sobol_sample(model, GsaOptions(n_samp_sobol = n_samp))
+    
+    samp_all = eval_input[0]
+    samp_a = samp_all[:n_samp]
+    samp_b = samp_all[n_samp:2*n_samp]
+    assert samp_all.shape == ((n_poi+2)*n_samp, n_poi)
+    for i_poi in range(n_poi):
+        samp_ab = samp_all[(i_poi+2)*n_samp:(i_poi+3)*n_samp]
+        assert np.array_equal(samp_ab[:, i_poi], samp_b[:, i_poi])
+        assert np.array_equal(np.delete(samp_ab, i_poi, axis = 1), \
+                              np.delete(samp_a, i_poi, axis = 1))
+    
+#Check float32 storage gives the same indices as float64 to a loose tolerance
+def test_sobol_float32_dtype():
+    n_samp = 2**12
+    n_poi = 3
+    sample = np.random.default_rng(10).uniform(size = (2*n_samp, n_poi))
+    sample_fcn = lambda n: sample[:n]
+    eval_fcn = lambda pois: pois[:, 0] + 2*pois[:, 1]**2 + pois[:, 0]*pois[:, 2]
+    model = SimpleNamespace(n_poi = n_poi, n_qoi = 1, sample_fcn = sample_fcn, \
+                            eval_fcn = eval_fcn)
+    
+    (f_a, f_b, f_ab, f_d, _) = get_sobol_sample(model, GsaOptions(n_samp_sobol = n_samp))
+    (sobol_base, sobol_tot) = calculate_sobol(f_a, f_b, f_ab, f_d)
+    (f_a, f_b, f_ab, f_d, _) = get_sobol_sample(model, GsaOptions(n_samp_sobol = n_samp, \
+                                                                  dtype = np.float32))
+    assert f_a.dtype == np.float32 and f_ab.dtype == np.float32
+    (sobol_base32, sobol_tot32) = calculate_sobol(f_a, f_b, f_ab, f_d)
+    
+    assert np.allclose(sobol_base32, sobol_base, rtol = 1e-3, atol = 1e-4)
+    assert np.allclose(sobol_tot32, sobol_tot, rtol = 1e-3, atol = 1e-4)
+    
 #==============================================================================
 #------------------------------Morris Sampling---------------------------------
 #==============================================================================
@@ -169,6 +284,7 @@ def test_morris_seperating_3samp8poi():
 
 # 1)======================satelli_sample test==================================
 # 1a) Check low discrepancy sampling has no repeated values
+@pytest.mark.filterwarnings("ignore:Saltelli sample")
 def test_satelli_repeats():
     random.seed(10)
     n_samp = 6
@@ -187,6 +303,7 @@ def test_satelli_repeats():
     assert np.all(sample_diff)
     
 # 1b) Check sample is entirely between [0,1]
+@pytest.mark.filterwarnings("ignore:Saltelli sample")
 def test_satelli_ranges():
     random.seed(10)
     n_samp = 1000
@@ -196,6 +313,7 @@ def test_satelli_ranges():
     assert np.min(sample) >= 0 and np.max(sample) <= 1
     
 # 1c) Check mean is .5 for each poi
+@pytest.mark.filterwarnings("ignore:Saltelli sample")
 def test_satelli_mean():
     random.seed(10)
     n_samp = 1000000
@@ -205,6 +323,7 @@ def test_satelli_mean():
     assert np.allclose(np.mean(sample, axis = 0), .5, rtol = 1e-2, atol = 1e-2)
     
 # 1d) Check variance is 1/12 for each poi
+@pytest.mark.filterwarnings("ignore:Saltelli sample")
 def test_satelli_var():
     random.seed(10)
     n_samp = 1000000
@@ -212,9 +331,28 @@ def test_satelli_var():
     sample = saltelli_sample(n_samp, n_poi)
     
     assert np.allclose(np.var(sample, axis = 0), 1/12, rtol = 1e-2, atol = 1e-2)
+
+# 1e) Check a warning is only given when the Sobol points are truncated
+def test_satelli_power_of_2_warning():
+    with pytest.warns(UserWarning):
+        saltelli_sample(12, 2)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        sample = saltelli_sample(16, 2)
+    assert sample.shape == (16, 2)
+
+# 1f) Check odd sample sizes split the extra point into the first half
+def test_satelli_odd():
+    n_samp = 9
+    n_poi = 2
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        sample = saltelli_sample(n_samp, n_poi)
+    assert sample.shape == (n_samp, n_poi) and np.min(sample) >= 0 and np.max(sample) <= 1
 # 2)=========================saltelli_uniform test=============================
     
 # 2a) Check mean is (b-a)/2 for each poi
+@pytest.mark.filterwarnings("ignore:Saltelli sample")
 def test_satelli_uniform_mean():
     random.seed(10)
     n_samp = 1000000
@@ -230,6 +368,7 @@ def test_satelli_uniform_mean():
     assert np.allclose(np.mean(sample, axis = 0), expected_mean , rtol = 1e-2, atol = 1e-2)
     
 # 2b) Check variance is (b-a)**2/12 for each poi
+@pytest.mark.filterwarnings("ignore:Saltelli sample")
 def test_satelli_uniform_var():
     random.seed(10)
     n_samp = 1000000
@@ -251,6 +390,7 @@ def test_satelli_uniform_var():
     assert np.allclose(sample_var, expected_var , rtol = 1e-2, atol = 1e-2)
     
 # 2c) Check all samples in [a,b]
+@pytest.mark.filterwarnings("ignore:Saltelli sample")
 def test_saltelli_uniform_ranges():
     random.seed(10)
     n_samp = 1000000
@@ -271,6 +411,7 @@ def test_saltelli_uniform_ranges():
 # 3)=========================saltelli_normal test=============================
     
 # 3a) Check mean is mu for each poi
+@pytest.mark.filterwarnings("ignore:Saltelli sample")
 def test_satelli_normal_mean():
     random.seed(10)
     n_samp = 1000000
@@ -287,7 +428,8 @@ def test_satelli_normal_mean():
     assert np.allclose(sample_mean, expected_mean , rtol = 1e-2, atol = 1e-2)
     
 # 3b) Check variance is sigma**2 for each poi
-def test_satelli_uniform_var():
+@pytest.mark.filterwarnings("ignore:Saltelli sample")
+def test_satelli_normal_var():
     random.seed(10)
     n_samp = 1000000
     n_poi = 6
@@ -381,7 +523,7 @@ def test_normal_mean():
     assert np.allclose(true_mean, expected_mean , rtol = 1e-2, atol = 1e-2)
     
 # 5b) Check variance is sigma**2 for each poi
-def test_satelli_uniform_var():
+def test_normal_var():
     random.seed(10)
     n_samp = 1000000
     n_poi = 6
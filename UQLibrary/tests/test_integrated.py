@@ -8,6 +8,7 @@ Created on Mon Feb  7 12:54:21 2022
 
 import numpy as np
 import sys
+import pytest
 
 #Load functions to be tested
 sys.path.insert(0, '../../')
@@ -123,4 +124,72 @@ def test_linear_portfolio():
     
 #     results = uq.run_uq(model, options)
 #     assert np.allclose(results.gsa.morris_mean_abs, np.array([.1448,.2422, 1.0257, 1.0012])*10**4, rtol = 10**(-2))
-    
\ No newline at end of file
+    
+
+#==============================================================================
+#----------------------------Model construction tests--------------------------
+#==============================================================================
+
+#----------------------------------Names---------------------------------------
+def test_auto_names():
+    names = uq.normalize_names("auto", 12, 'POI')
+    assert names.shape == (12,)
+    assert names[0] == "POI0" and names[11] == "POI11"
+    
+def test_explicit_names():
+    assert np.array_equal(uq.normalize_names(["a", "b"], 2, 'QOI'), np.array(["a", "b"]))
+    assert np.array_equal(uq.normalize_names("a", 1, 'QOI'), np.array(["a"]))
+    
+def test_names_wrong_count():
+    with pytest.raises(Exception, match = "Incorrect number of entries in name_poi"):
+        uq.normalize_names(["a", "b"], 3, 'POI')
+    with pytest.raises(Exception, match = "Only one qoi name entered"):
+        uq.normalize_names("a", 2, 'QOI')
+        
+#------------------------------Distribution parameters-------------------------
+def test_dist_param_uniform_auto():
+    base_poi = np.array([1., 2., 4.])
+    dist_param = uq.normalize_dist_param("auto", "uniform", 3, base_poi, np.empty(0))
+    assert dist_param.shape == (2, 3)
+    assert np.allclose(dist_param, np.array([.8*base_poi, 1.2*base_poi]))
+    
+def test_dist_param_normal_auto():
+    base_poi = np.array([1., 2., 4.])
+    dist_param = uq.normalize_dist_param("auto", "normal", 3, base_poi, np.empty(0))
+    assert dist_param.shape == (2, 3)
+    assert np.allclose(dist_param, np.array([base_poi, .2*base_poi]))
+    
+def test_dist_param_normal_cov():
+    base_poi = np.array([1., 2., 4.])
+    cov = np.array([[.1, .01, 0], [.01, .2, 0], [0, 0, .3]])
+    for dist_param_entry in ("auto", "cov"):
+        dist_param = uq.normalize_dist_param(dist_param_entry, "saltelli normal", 3, \
+                                             base_poi, cov)
+        assert dist_param.shape == (2, 3)
+        assert np.allclose(dist_param, np.array([base_poi, [.1, .2, .3]]))
+    
+def test_dist_param_model():
+    model = uq.Model(eval_fcn = lambda x: np.sum(x), base_poi = np.array([1., 2.]), \
+                     dist_type = "normal", cov = np.diag([.5, .25]))
+    assert np.array_equal(model.name_poi, np.array(["POI0", "POI1"]))
+    assert np.array_equal(model.name_qoi, np.array(["QOI0"]))
+    assert np.allclose(model.dist_param, np.array([[1., 2.], [.5, .25]]))
+    
+#----------------------------------Copy----------------------------------------
+def test_model_copy_independent():
+    model = uq.Model(eval_fcn = lambda x: np.sum(x), base_poi = np.array([1., 2.]), \
+                     dist_type = "saltelli uniform")
+    dist_param = model.dist_param.copy()
+    model_copy = model.copy()
+    
+    model_copy.base_poi[0] = 99
+    model_copy.dist_param[:] = np.array([[10., 20.], [11., 21.]])
+    
+    assert np.array_equal(model.base_poi, np.array([1., 2.]))
+    assert np.array_equal(model.dist_param, dist_param)
+    #The copy samples from its own parameters and the original from its own
+    sample_copy = model_copy.sample_fcn(8)
+    sample = model.sample_fcn(8)
+    assert np.all(sample_copy >= model_copy.dist_param[0]) and \
+        np.all(sample_copy <= model_copy.dist_param[1])
+    assert np.all(sample >= dist_param[0]) and np.all(sample <= dist_param[1])
@@ -27,6 +27,17 @@ def third_order_multi_poly(x,c):
     p_x = np.sum(c[0,:]+c[1,:]*x+c[2,:]*x**2 + c[3,:]* x**3)
     return  np.array([p_x])
 
+def third_order_multi_poly_vectorized(x,c):
+    p_x = np.sum(c[0,:]+c[1,:]*x+c[2,:]*x**2 + c[3,:]* x**3, axis = -1)
+    return  p_x
+
+def third_order_multi_qoi_poly(x,c):
+    #Evaluates each QOI polynomial over the last axis of x so single POI vectors
+    #   and stacked rows of POI vectors are both accepted
+    x = x[..., np.newaxis]
+    p_x = np.sum(c[0]+c[1]*x+c[2]*x**2 + c[3]* x**3, axis = -2)
+    return  p_x
+
 def third_order_multi_poly_grad(x,c):
     gradf = c[1,:] + 2*c[2,:]*x + 3*c[3,:]*x**2
     return gradf
@@ -81,4 +92,47 @@ def test_complex_multi_poly():
     grad = third_order_multi_poly_grad(x_rand, c_rand)
     assert np.allclose(grad_approx,grad)
     
+#Vectorized evaluation
+#1) R3 -> R1 finite difference
+def test_finite_diff_multi_poly_vectorized():
+    c_rand=np.random.uniform(size=(4,3))
+    x_rand = np.random.uniform(size= (3))
+    
+    fcn = lambda x: third_order_multi_poly_vectorized(x, c_rand)
+    grad_approx = get_jacobian(fcn, x_rand, 1e-8, "finite", vectorize = True)
+    grad = third_order_multi_poly_grad(x_rand, c_rand)
+    assert np.allclose(grad_approx,grad)
+    
+#2) R3 -> R1 complex step
+def test_complex_multi_poly_vectorized():
+    c_rand=np.random.uniform(size=(4,3))
+    x_rand = np.random.uniform(size= (3))
+    
+    fcn = lambda x: third_order_multi_poly_vectorized(x, c_rand)
+    grad_approx = get_jacobian(fcn, x_rand, 1e-16, "complex", vectorize = True)
+    grad = third_order_multi_poly_grad(x_rand, c_rand)
+    assert np.allclose(grad_approx,grad)
+    
+#3) R3 -> R2 scaled finite difference, vectorized against looped evaluation
+def test_finite_diff_multi_qoi_scaled_vectorized():
+    c_rand=np.random.uniform(size=(4,3,2))
+    x_rand = np.random.uniform(size= (3))
+    
+    fcn = lambda x: third_order_multi_qoi_poly(x, c_rand)
+    jac_vectorized = get_jacobian(fcn, x_rand, 1e-8, "finite", scale = True, vectorize = True)
+    jac_loop = get_jacobian(fcn, x_rand, 1e-8, "finite", scale = True)
+    assert jac_vectorized.shape == (2,3)
+    assert np.allclose(jac_vectorized,jac_loop)
+    
+#4) R3 -> R2 scaled complex step, vectorized against looped evaluation
+def test_complex_multi_qoi_scaled_vectorized():
+    c_rand=np.random.uniform(size=(4,3,2))
+    x_rand = np.random.uniform(size= (3))
+    
+    fcn = lambda x: third_order_multi_qoi_poly(x, c_rand)
+    jac_vectorized = get_jacobian(fcn, x_rand, 1e-16, "complex", scale = True, vectorize = True)
+    jac_loop = get_jacobian(fcn, x_rand, 1e-16, "complex", scale = True)
+    assert jac_vectorized.shape == (2,3)
+    assert np.allclose(jac_vectorized,jac_loop)
+    
 #--------------------------------Boundary Point Tests--------------------------
\ No newline at end of file